@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import serial, serial.tools.list_ports
-import pyperclip
+import collections
+import select
 import time
 import json
 import sys
@@ -8,13 +9,12 @@ import re
 import os
 
 from platformdirs import user_data_dir
-from datetime import datetime
 
-from PyQt6.QtGui import QTextCharFormat, QColor, QFont, QTextCursor, QTextDocument, QIcon
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QMutex
+from PyQt6.QtGui import QTextCharFormat, QColor, QFont, QTextCursor, QIcon
+from PyQt6.QtCore import QThread, QTimer, QPoint, QEvent, pyqtSignal, pyqtSlot, Qt
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QMenu,
-    QPushButton, QTextEdit, QComboBox, QLabel, QMessageBox
+    QPushButton, QTextEdit, QPlainTextEdit, QComboBox, QLabel, QMessageBox
 )
 
 def resource_path(relative_path):
@@ -25,13 +25,157 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+# Log decoration per forwarding direction: (tag, color)
+DIRECTION_STYLES = {
+    'AtoB': ('[A->B]', "#f44250"),
+    'BtoA': ('[A<-B]', "#4285f4"),
+}
+
+# Frames longer than this are logged in buffer-sized pieces
+FRAME_BUFFER_SIZE = 8192
+
+# -------------------------------------------------
+# Forwarding loop, specialized per direction
+# -------------------------------------------------
+def make_forwarder(thread, source_conn, dest_conn, direction, gap_threshold_ns,
+                   emit_frame, emit_error):
+    """
+    Build the forwarding loop for one direction as a closure.
+    Everything fixed for the connection is bound here, so the loop body only touches
+    local/closure names. The returned function runs until thread.running goes False.
+    """
+    now_ns = time.time_ns
+    wall_time = time.time
+
+    # Preallocated frame buffer; only the first buf_len bytes are valid
+    buf = bytearray(FRAME_BUFFER_SIZE)
+    buf_len = 0
+    last_rx_ns = 0
+
+    # On POSIX, wait on / read from / write to the raw fds (pyserial stays on Windows,
+    # where COM handles cannot be select()ed)
+    if sys.platform != 'win32':
+        src_fd = source_conn.fileno()
+        dst_fd = dest_conn.fileno()
+        timeout = source_conn.timeout
+        os_read, os_write, wait = os.read, os.write, select.select
+
+        def read_chunk():
+            """Wait for readiness on the source fd (or timeout), then read everything available."""
+            ready, _, _ = wait((src_fd,), (), (), timeout)
+            if not ready:
+                return b''
+            data = os_read(src_fd, 65536)
+            if not data:
+                raise serial.SerialException("device reports readiness to read but returned no data")
+            return data
+
+        def write_dest(data):
+            try:
+                n = os_write(dst_fd, data)
+            except BlockingIOError:
+                n = 0
+            if n == len(data):
+                return
+            # The port is non-blocking and the peer isn't draining fast enough. Wait for room
+            # ourselves: pyserial's write spins on EAGAIN and ignores cancel_write, while this
+            # sleeps in select() and gives up once the thread is asked to stop.
+            rest = memoryview(data)[n:]
+            while rest:
+                if not thread.running:
+                    raise serial.SerialException(f"stopped with {len(rest)} byte(s) unsent")
+                _, writable, _ = wait((), (dst_fd,), (), timeout)
+                if not writable:
+                    continue
+                try:
+                    rest = rest[os_write(dst_fd, rest):]
+                except BlockingIOError:
+                    pass
+    else:
+        src_read = source_conn.read
+
+        def read_chunk():
+            """Take everything already queued; otherwise block for the first byte and drain the rest."""
+            waiting = source_conn.in_waiting
+            if waiting:
+                return src_read(waiting)
+            head = src_read(1)
+            if head:
+                return head + src_read(source_conn.in_waiting)
+            return head
+
+        write_dest = dest_conn.write
+
+    def emit_buffered():
+        """Hand the buffered frame to the GUI thread, which does the formatting."""
+        nonlocal buf_len
+        # Queued across threads; Qt serializes delivery on the GUI thread
+        emit_frame(bytes(memoryview(buf)[:buf_len]), direction, wall_time())
+        buf_len = 0
+
+    def append_rx(data):
+        """Append received bytes into the frame buffer."""
+        nonlocal buf_len
+        n = len(data)
+        if buf_len + n <= FRAME_BUFFER_SIZE:
+            buf[buf_len:buf_len + n] = data
+            buf_len += n
+            return
+        # Frame outgrew the buffer: emit what fits and keep going (slicing a view copies nothing)
+        mv = memoryview(data)
+        pos = 0
+        while pos < n:
+            if buf_len == FRAME_BUFFER_SIZE:
+                emit_buffered()
+            take = min(n - pos, FRAME_BUFFER_SIZE - buf_len)
+            buf[buf_len:buf_len + take] = mv[pos:pos + take]
+            buf_len += take
+            pos += take
+
+    def forward():
+        nonlocal last_rx_ns
+        while thread.running:
+            try:
+                data = read_chunk()
+                if data:
+                    last_rx_ns = now_ns()
+
+                    # Forward to the destination port first, then buffer for logging.
+                    # Pass the bytes as-is: pyserial copies anything that isn't bytes.
+                    try:
+                        write_dest(data)
+                    except Exception as e:
+                        # Log once; keep going
+                        emit_error(f"[ERROR] write({direction}) -> {e}\n", "red")
+                    append_rx(data)
+
+                elif buf_len and (now_ns() - last_rx_ns) >= gap_threshold_ns:
+                    # Timed out and the line has been idle long enough -> frame is complete
+                    emit_buffered()
+
+            except Exception as e:
+                # Emit error (rare) and keep trying
+                emit_error(f"[ERROR] Forwarding error ({direction}): {e}\n", "red")
+                time.sleep(0.2)
+
+        # Thread is stopping: flush any remaining buffered frame
+        try:
+            if buf_len:
+                emit_buffered()
+        except Exception:
+            pass
+
+    return forward
+
+
 # -------------------------------------------------
 # Serial forwarding worker with time/baud-aware buffering
 # -------------------------------------------------
 class SerialForwarderThread(QThread):
     log_signal = pyqtSignal(str, str)  # (text, color)
+    frame_signal = pyqtSignal(bytes, str, float)  # (data, direction, timestamp)
 
-    def __init__(self, source_conn, dest_conn, direction, baud, ui_log_mutex: QMutex,
+    def __init__(self, source_conn, dest_conn, direction, baud,
                  gap_chars: int = 3, bits_per_char: int = 10):
         """
         direction: 'AtoB' or 'BtoA'
@@ -50,98 +194,17 @@ class SerialForwarderThread(QThread):
         self.bits_per_char = max(int(bits_per_char), 9)  # conservative minimum
         self.char_time_ns = int(1e9 * self.bits_per_char / self.baud)
         self.flush_gap_ns = max(self.char_time_ns * max(gap_chars, 1), 100_000)  # ≥ 0.1 ms
-        self.poll_interval_s = max(self.char_time_ns / 2 / 1e9, 0.0005)
-
-        self.msg_buffer = bytearray()
-        self.msg_start_ns = 0
-        self.last_rx_ns = 0
-
-        # Optional shared mutex to avoid simultaneous emits from both threads
-        self.ui_log_mutex = ui_log_mutex
+        gap_threshold_ns = (self.flush_gap_ns * 3) // 2  # 1.5 gaps, integer-only
 
-    def _flush_frame_if_due(self, now_ns: int):
-        """Flush buffered frame if idle gap elapsed."""
-        if not self.msg_buffer:
-            return
-        if (now_ns - self.last_rx_ns) >= self.flush_gap_ns*1.5:
-            # Build one consolidated log entry
-            hex_data = ' '.join(f'{b:02X}' for b in self.msg_buffer)
-            atob = self.direction == 'AtoB'
-            tag = '[A->B]' if atob else '[A<-B]'
-            color = "#f44250" if atob else "#4285f4"
-            timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S.%f")
-            prefix = f"{tag} {timestamp} : "
-
-            # Ensure atomic emit wrt the other thread
-            if self.ui_log_mutex is not None:
-                self.ui_log_mutex.lock()
-            try:
-                self.log_signal.emit(f"{prefix}{hex_data}\n", color)
-            finally:
-                if self.ui_log_mutex is not None:
-                    self.ui_log_mutex.unlock()
-
-            self.msg_buffer.clear()
-            self.msg_start_ns = 0
-            self.last_rx_ns = 0
-
-    def _append_rx(self, data: bytes, now_ns: int):
-        """Append received bytes into buffer and forward to dest."""
-        if not data:
-            return
-        # Start-of-frame timestamp
-        if not self.msg_buffer:
-            self.msg_start_ns = now_ns
-        self.msg_buffer.extend(data)
-        self.last_rx_ns = now_ns
+        # Block in read() instead of polling; wake up at least once per gap to flush frames
+        self.source_conn.timeout = max(self.flush_gap_ns / 1e9, 0.001)
 
-        # Forward to the destination port
-        try:
-            self.dest_conn.write(data)
-        except Exception as e:
-            # Log once; keep going
-            if self.ui_log_mutex is not None:
-                self.ui_log_mutex.lock()
-            try:
-                self.log_signal.emit(f"[ERROR] write({self.direction}) -> {e}\n", "red")
-            finally:
-                if self.ui_log_mutex is not None:
-                    self.ui_log_mutex.unlock()
+        self._forward = make_forwarder(self, source_conn, dest_conn, direction, gap_threshold_ns,
+                                       self.frame_signal.emit, self.log_signal.emit)
 
     def run(self):
         self.running = True
-        while self.running:
-            try:
-                # Pull whatever is currently waiting
-                in_wait = self.source_conn.in_waiting
-                if in_wait:
-                    data = self.source_conn.read(in_wait)
-                    now_ns = time.time_ns()
-                    if data:
-                        self._append_rx(data, now_ns)
-                else:
-                    # No new data -> check if a frame is ready to flush
-                    self._flush_frame_if_due(time.time_ns())
-
-                # Small poll sleep tuned by baud rate
-                time.sleep(self.poll_interval_s)
-
-            except Exception as e:
-                # Emit error (rare) and keep trying
-                if self.ui_log_mutex is not None:
-                    self.ui_log_mutex.lock()
-                try:
-                    self.log_signal.emit(f"[ERROR] Forwarding error ({self.direction}): {e}\n", "red")
-                finally:
-                    if self.ui_log_mutex is not None:
-                        self.ui_log_mutex.unlock()
-                time.sleep(0.2)
-
-        # Thread is stopping: flush any remaining buffered frame
-        try:
-            self._flush_frame_if_due(time.time_ns() + self.flush_gap_ns + 1)
-        except Exception:
-            pass
+        self._forward()
 
     def stop(self):
         self.running = False
@@ -150,7 +213,9 @@ class SerialForwarderThread(QThread):
 # -------------------------------------------------
 # Read-only text box with copy/clear context menu
 # -------------------------------------------------
-class CTextEdit(QTextEdit):
+class CTextEdit(QPlainTextEdit):
+    flag_requested = pyqtSignal()  # owner appends the flag marker through its log path
+
     def __init__(self, parent=None):
         super().__init__(parent)
         # Read-only, but allow selection by mouse/keyboard
@@ -162,13 +227,26 @@ class CTextEdit(QTextEdit):
 
         # --- highlight state ---
         self._active_selection = ""
+        self._hl_pattern = None
         self._hl_format = QTextCharFormat()
         # Soft yellow highlight; tweak to taste
         self._hl_format.setBackground(QColor('#fff59d'))
 
-        # Re-run highlights when the user changes selection or text changes
+        # Live view only; the full session goes to the log file
+        self.document().setMaximumBlockCount(5000)
+        # Read-only log: keeping an undo stack of every insert is pure overhead
+        self.setUndoRedoEnabled(False)
+
+        # Highlights only cover the visible text; refresh them shortly after edits or scrolling
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(100)
+        self._rescan_timer.timeout.connect(self._apply_highlights)
+
+        # Re-run highlights when the user changes selection, text changes or the view scrolls
         self.selectionChanged.connect(self._on_selection_changed)
         self.document().contentsChange.connect(self._on_contents_change)
+        self.verticalScrollBar().valueChanged.connect(self._on_contents_change)
 
     # ----- context menu (unchanged items + improved copy) -----
     def contextMenuEvent(self, event):
@@ -184,16 +262,11 @@ class CTextEdit(QTextEdit):
             # Copy selection if present; otherwise copy entire text
             txt = self.textCursor().selectedText() or self.toPlainText()
             # Normalize paragraph separator to newline for clipboard
-            pyperclip.copy(txt.replace('\u2029', '\n'))
+            QApplication.clipboard().setText(txt.replace('\u2029', '\n'))
 
         if action == flag_action:
-            cursor = self.textCursor()
-            fmt = QTextCharFormat()
-            fmt.setForeground(QColor('#fcfc4b'))
-            # fmt.setFontWeight(QFont.Weight.Bold)
-            cursor.setCharFormat(fmt)
-            cursor.insertText('◉\n')
-            self.setTextCursor(cursor)
+            # Not at self.textCursor(): that follows the user's clicks/selection, not the output
+            self.flag_requested.emit()
 
         elif action == clear_action:
             self.clear()
@@ -206,43 +279,78 @@ class CTextEdit(QTextEdit):
         else:
             super().keyPressEvent(event)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # A taller viewport may expose text outside the last highlighted range
+        self._on_contents_change()
+
     # ----- selection/highlight logic -----
     def _on_selection_changed(self):
         sel = self.textCursor().selectedText()
-        # Normalize newlines from selection (QTextEdit uses U+2029 in selections)
+        # Normalize newlines from selection (Qt uses U+2029 in selections)
         if sel:
             sel = sel.replace('\u2029', '\n')
         # Ignore empty/whitespace-only selections
         self._active_selection = sel if (sel and sel.strip()) else ""
+        self._hl_pattern = re.compile(re.escape(self._active_selection)) if self._active_selection else None
         self._apply_highlights()
 
     def _on_contents_change(self, *_):
-        # If a pattern is active, re-apply highlights when text changes
-        if self._active_selection:
-            self._apply_highlights()
-
-    def _apply_highlights(self):
-        if not self._active_selection:
-            self.setExtraSelections([])
-            return
-
+        # If a pattern is active, re-apply highlights within 100 ms. Don't restart a running
+        # timer: under steady traffic (or auto-scroll) it would never get to fire.
+        if self._active_selection and not self._rescan_timer.isActive():
+            self._rescan_timer.start()
+
+    def _visible_range(self):
+        """Return the (start, end) document positions shown in the viewport, plus a margin."""
+        top = self.cursorForPosition(QPoint(0, 0)).position()
+        bottom = self.cursorForPosition(QPoint(0, self.viewport().height())).position()
+        return top, bottom + 1024
+
+    def _find_matches(self, start, end):
+        """Return highlight selections for matches overlapping [start, end]."""
         doc = self.document()
+        # Document positions count UTF-16 units, not Python code points
+        pat_len = len(self._active_selection.encode('utf-16-le')) // 2
+        start = max(0, start - pat_len + 1)
+        end = min(doc.characterCount() - 1, end + pat_len)
+
+        # Only the requested slice is extracted; selections use U+2029 between blocks
         cur = QTextCursor(doc)
+        cur.setPosition(start)
+        cur.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        text = cur.selectedText().replace('\u2029', '\n')
+        # Match offsets only need converting if the slice has characters above U+FFFF
+        wide = not text.isascii() and len(text.encode('utf-16-le')) // 2 != len(text)
+        last_i = last_u = 0
         extras = []
 
         # Case-sensitive search (matches exactly what the user selected)
-        find_flags = QTextDocument.FindFlag.FindCaseSensitively
-
-        while True:
-            cur = doc.find(self._active_selection, cur, find_flags)
-            if cur.isNull():
-                break
+        for m in self._hl_pattern.finditer(text):
+            i, j = m.span()
+            if wide:
+                # Walk forward from the previous match, so the conversion stays linear overall
+                last_u += len(text[last_i:i].encode('utf-16-le')) // 2
+                last_i = i
+                u_start, u_end = last_u, last_u + len(m.group().encode('utf-16-le')) // 2
+            else:
+                u_start, u_end = i, j
+            cur = QTextCursor(doc)
+            cur.setPosition(start + u_start)
+            cur.setPosition(start + u_end, QTextCursor.MoveMode.KeepAnchor)
             sel = QTextEdit.ExtraSelection()
             sel.cursor = cur
             sel.format = self._hl_format
             extras.append(sel)
+        return extras
+
+    def _apply_highlights(self):
+        self._rescan_timer.stop()
+        if not self._active_selection:
+            self.setExtraSelections([])
+            return
 
-        self.setExtraSelections(extras)
+        self.setExtraSelections(self._find_matches(*self._visible_range()))
 
     def reapply_highlight(self):
         """Helper to re-apply current highlight after programmatic edits."""
@@ -264,17 +372,39 @@ class SerialMiddlemanApp(QWidget):
         self.setWindowIcon(QIcon(resource_path("assets\\icon.png")))
 
         self.CACHE_FILE = os.path.join(user_data_dir("WolfWire", "WolfWire"), "com_cache.json")
+        self.LOG_DIR = os.path.join(user_data_dir("WolfWire", "WolfWire"), "logs")
 
         self.serial_A = None
         self.serial_B = None
         self.thread_AtoB = None
         self.thread_BtoA = None
+        # forwarders that outlived disconnect_ports' bounded wait
+        self._stuck_threads = []
 
         # guard to avoid recursive updates when filtering combos
         self._updating_combos = False
+        # port list the combos were last filled with
+        self._last_ports = None
 
-        # Shared UI log mutex (prevents simultaneous emit from both threads)
-        self.log_mutex = QMutex()
+        # Log lines waiting to be appended to the textbox in one batch: (text, color)
+        self._pending = collections.deque()
+        self._flush_timer_armed = False
+
+        # Append-only session log file (open while connected)
+        self._log_fd = None
+
+        # Port/baud cache writes are debounced so rapid combo changes cost one write
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._do_save)
+        self._saved_ports = None  # last contents known to be on disk
+
+        # Reusable char formats keyed by color
+        self._fmt_cache = {}
+
+        # Timestamp text up to the second, rebuilt only when the second changes
+        self._ts_sec = None
+        self._ts_prefix = ""
 
         self.init_ui()
         self.refresh_com_ports()
@@ -288,6 +418,7 @@ class SerialMiddlemanApp(QWidget):
                 self.cached_ports = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             self.cached_ports = {}
+        self._saved_ports = self.cached_ports
 
         if not self.cached_ports:
             return
@@ -299,22 +430,40 @@ class SerialMiddlemanApp(QWidget):
         portB = self.cached_ports.get("portB")
         baud  = self.cached_ports.get("baud")
 
+        # Values come from the cache itself; don't let the change signals write them back
+        combos = (self.com_port_combo_A, self.com_port_combo_B, self.baud_rate_combo)
+        for combo in combos:
+            combo.blockSignals(True)
         if portA in ports:
             self.com_port_combo_A.setCurrentText(portA)
         if portB in ports:
             self.com_port_combo_B.setCurrentText(portB)
         if baud in rates:
             self.baud_rate_combo.setCurrentText(baud)
+        for combo in combos:
+            combo.blockSignals(False)
 
     def _save_cached_ports(self):
-        os.makedirs(os.path.dirname(self.CACHE_FILE), exist_ok=True)
+        self._save_timer.start(500)
+
+    def _do_save(self):
         data = {
             "portA": self.com_port_combo_A.currentText(),
             "portB": self.com_port_combo_B.currentText(),
             "baud": self.baud_rate_combo.currentText()
         }
-        with open(self.CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        # Nothing changed since the last write (e.g. a combo toggled back and forth)
+        if data == self._saved_ports:
+            return
+        payload = json.dumps(data)
+
+        # Write aside and swap in, so a crash never leaves a truncated cache
+        os.makedirs(os.path.dirname(self.CACHE_FILE), exist_ok=True)
+        tmp = self.CACHE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, self.CACHE_FILE)
+        self._saved_ports = data
 
     # ---------- UI ----------
     def init_ui(self):
@@ -349,18 +498,33 @@ class SerialMiddlemanApp(QWidget):
         self.connect_button = QPushButton("Connect")
         self.connect_button.clicked.connect(self.toggle_connection)
 
-        self.status_label = QLabel("Disconnected")
-        self.status_label.setStyleSheet("background-color: red;")
+        # Colors are picked by the 'state' property, so toggling never reparses the stylesheet
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet(
+            "QLabel[state='off'] { background-color: red; }"
+            "QLabel[state='on'] { background-color: green; }"
+        )
+        self._set_status(False)
         config_layout.addWidget(self.connect_button)
         config_layout.addWidget(self.status_label)
 
         layout.addLayout(config_layout)
 
         self.textbox = CTextEdit()
+        self.textbox.flag_requested.connect(self._log_flag)
         layout.addWidget(self.textbox)
+        # Log output always goes to the end, independent of the user's cursor/selection
+        self._log_cursor = QTextCursor(self.textbox.document())
 
         self.setLayout(layout)
 
+    def _set_status(self, connected: bool):
+        self.status_label.setText("Connected" if connected else "Disconnected")
+        self.status_label.setProperty("state", "on" if connected else "off")
+        # Re-evaluate the property selectors
+        self.status_label.style().unpolish(self.status_label)
+        self.status_label.style().polish(self.status_label)
+
     # ---------- Port listing & filtering ----------
     def _list_active_ports(self):
         """Return list of strings like ['COM3', 'COM4', ...] on Windows or '/dev/tty...' on *nix."""
@@ -390,9 +554,11 @@ class SerialMiddlemanApp(QWidget):
         selA = self.com_port_combo_A.currentText()
         selB = self.com_port_combo_B.currentText()
 
-        # First, fill both with the full list
-        self._fill_combo(self.com_port_combo_A, ports, keep_selection=selA)
-        self._fill_combo(self.com_port_combo_B, ports, keep_selection=selB)
+        # First, fill both with the full list (unless nothing was plugged/unplugged)
+        if ports != self._last_ports:
+            self._fill_combo(self.com_port_combo_A, ports, keep_selection=selA)
+            self._fill_combo(self.com_port_combo_B, ports, keep_selection=selB)
+            self._last_ports = ports
 
         # Disable Connect if less than 2 ports are available
         self.connect_button.setEnabled(len(ports) >= 2)
@@ -457,37 +623,56 @@ class SerialMiddlemanApp(QWidget):
         # Start forwarders (with buffering)
         # bits_per_char: 10 for 8N1; adjust if you later expose parity/stop settings
         self.thread_AtoB = SerialForwarderThread(self.serial_A, self.serial_B, "AtoB",
-                                                 baud_rate, self.log_mutex,
+                                                 baud_rate,
                                                  gap_chars=3, bits_per_char=10)
         self.thread_BtoA = SerialForwarderThread(self.serial_B, self.serial_A, "BtoA",
-                                                 baud_rate, self.log_mutex,
+                                                 baud_rate,
                                                  gap_chars=3, bits_per_char=10)
 
         self.thread_AtoB.log_signal.connect(self.log_text)
         self.thread_BtoA.log_signal.connect(self.log_text)
+        self.thread_AtoB.frame_signal.connect(self.log_frame)
+        self.thread_BtoA.frame_signal.connect(self.log_frame)
+        self._open_session_log()
         self.thread_AtoB.start()
         self.thread_BtoA.start()
 
-        # UI state
-        self.status_label.setText("Connected")
-        self.status_label.setStyleSheet("background-color: green;")
+        # UI state (batched into a single repaint)
+        self.setUpdatesEnabled(False)
+        self._set_status(True)
         self.connect_button.setText("Disconnect")
         self.com_port_combo_A.setEnabled(False)
         self.com_port_combo_B.setEnabled(False)
         self.baud_rate_combo.setEnabled(False)
         self.refresh_button.setEnabled(False)
+        self.setUpdatesEnabled(True)
         self.log_text(f"[INFO] Bridging {portA} <=> {portB} @ {baud_rate} bps\n", "green")
 
     def disconnect_ports(self):
-        # Stop threads
-        if self.thread_AtoB:
-            self.thread_AtoB.stop()
-            self.thread_AtoB.wait()
-            self.thread_AtoB = None
-        if self.thread_BtoA:
-            self.thread_BtoA.stop()
-            self.thread_BtoA.wait()
-            self.thread_BtoA = None
+        # Stop threads: signal both before waiting, so their read timeouts overlap
+        threads = [t for t in (self.thread_AtoB, self.thread_BtoA) if t]
+        for t in threads:
+            t.stop()
+        for t in threads:
+            if t.wait(200):
+                continue
+            # Still blocked in pyserial (Windows): cancel the pending read and write (pyserial >= 3.1).
+            # On POSIX both are no-ops: the forwarder's own select() waits time out after one
+            # flush gap and notice stop(), so it normally never gets here.
+            for cancel in (t.source_conn.cancel_read, t.dest_conn.cancel_write):
+                try:
+                    cancel()
+                except Exception:
+                    pass
+            if not t.wait(1000):
+                # Don't hang the GUI; closing the ports below makes the stuck call fail.
+                # Keep a reference so the QThread isn't destroyed while still running.
+                self._stuck_threads.append(t)
+                self.log_text(f"[ERROR] Forwarder {t.direction} did not stop in time\n", "red")
+        self._stuck_threads = [t for t in self._stuck_threads if t.isRunning()]
+        self.thread_AtoB = None
+        self.thread_BtoA = None
+        self._close_session_log()
 
         # Close serials
         if self.serial_A and self.serial_A.is_open:
@@ -497,9 +682,9 @@ class SerialMiddlemanApp(QWidget):
         self.serial_A = None
         self.serial_B = None
 
-        # UI back to normal
-        self.status_label.setText("Disconnected")
-        self.status_label.setStyleSheet("background-color: red;")
+        # UI back to normal (batched into a single repaint)
+        self.setUpdatesEnabled(False)
+        self._set_status(False)
         self.connect_button.setText("Connect")
         self.com_port_combo_A.setEnabled(True)
         self.com_port_combo_B.setEnabled(True)
@@ -508,25 +693,107 @@ class SerialMiddlemanApp(QWidget):
 
         # Refresh available ports (in case a device was unplugged/plugged)
         self.refresh_com_ports()
+        self.setUpdatesEnabled(True)
 
     # ---------- Logging & helpers ----------
-    def _log_text_internal(self, text, color="gray"):
-        cursor = self.textbox.textCursor()
+    def _mk_fmt(self, color):
         fmt = QTextCharFormat()
         fmt.setForeground(QColor(color))
         # fmt.setFontWeight(QFont.Weight.Bold)
-        cursor.setCharFormat(fmt)
-        cursor.insertText(text)
-        self.textbox.setTextCursor(cursor)
+        return fmt
 
+    def _log_text_internal(self, text, color="gray"):
+        fmt = self._fmt_cache.get(color)
+        if fmt is None:
+            fmt = self._fmt_cache[color] = self._mk_fmt(color)
+        # Keep following the output only if the view was already at the bottom
+        bar = self.textbox.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        self._log_cursor.movePosition(QTextCursor.MoveOperation.End)
+        self._log_cursor.insertText(text, fmt)
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    def _drain_pending(self):
+        """Append all queued log lines, one insert per run of same-colored lines."""
+        self._flush_timer_armed = False
+        runs = []
+        while self._pending:
+            text, color = self._pending.popleft()
+            if runs and runs[-1][1] == color:
+                runs[-1][0].append(text)
+            else:
+                runs.append(([text], color))
+        for parts, color in runs:
+            text = ''.join(parts)
+            self._log_text_internal(text, color)
+            if self._log_fd is not None:
+                try:
+                    os.write(self._log_fd, text.encode("utf-8"))
+                except OSError as e:
+                    # Disk full / drive gone: keep the live view, continue without a file
+                    os.close(self._log_fd)
+                    self._log_fd = None
+                    self._log_text_internal(f"[ERROR] Writing log file failed, logging stopped: {e}\n", "red")
+
+    def _open_session_log(self):
+        path = os.path.join(self.LOG_DIR, time.strftime("session_%Y%m%d_%H%M%S.log"))
+        try:
+            os.makedirs(self.LOG_DIR, exist_ok=True)
+            self._log_fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError as e:
+            self.log_text(f"[ERROR] Could not open log file {path}: {e}\n", "red")
+            return
+        self.log_text(f"[INFO] Logging to {path}\n", "green")
+
+    def _close_session_log(self):
+        # Deliver only the frames queued by the stopped forwarders (queued slot calls on self),
+        # then write them out
+        QApplication.sendPostedEvents(self, QEvent.Type.MetaCall)
+        self._drain_pending()
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+
+    # Declared as slots so queued forwarder signals are posted to this object
+    # (see _close_session_log), rather than to an internal PyQt proxy
+    @pyqtSlot(str, str)
     def log_text(self, text, color):
-        self._log_text_internal(text, color)
+        # Bursts of lines are coalesced into a single textbox update every 30 ms
+        self._pending.append((text, color))
+        if not self._flush_timer_armed:
+            self._flush_timer_armed = True
+            QTimer.singleShot(30, self._drain_pending)
+
+    def _log_flag(self):
+        # Queued like any other line: ordered with pending output and written to the session file
+        self.log_text('◉\n', '#fcfc4b')
+
+    def _format_timestamp(self, ts: float):
+        """Local time as 'dd/mm/YYYY HH:MM:SS.ffffff'."""
+        sec = int(ts)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = time.strftime("%d/%m/%Y %H:%M:%S", time.localtime(sec))
+        return f"{self._ts_prefix}.{int((ts - sec) * 1_000_000):06d}"
+
+    @pyqtSlot(bytes, str, float)
+    def log_frame(self, data: bytes, direction: str, ts: float):
+        """Format a forwarded frame as one hex log line."""
+        tag, color = DIRECTION_STYLES[direction]
+        timestamp = self._format_timestamp(ts)
+        self.log_text(f"{tag} {timestamp} : {data.hex(' ').upper()}\n", color)
 
     def show_error(self, message):
         QMessageBox.warning(self, "Error", message)
 
     def closeEvent(self, event):
         self.disconnect_ports()
+        for t in self._stuck_threads:
+            t.wait(1000)
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._do_save()
         event.accept()
 
 